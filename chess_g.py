@@ -1,182 +1,387 @@
+import sys
+
 import pygame
 
+from search import Search
+
 WIDTH, HEIGHT = 640, 640
 SQ_SIZE = WIDTH // 8
 
+# Pixel offsets per board column/row; board row 0 is drawn at the bottom.
+X_PX = tuple(x*SQ_SIZE for x in range(8))
+Y_PX = tuple((7 - y)*SQ_SIZE for y in range(8))
+SQ_RECTS = [[pygame.Rect(X_PX[x], Y_PX[y], SQ_SIZE, SQ_SIZE) for x in range(8)] for y in range(8)]
+
 class ImageProvider:
     def get_image(self, piece):
         raise NotImplementedError("Subclasses must implement get_image.")
 
 class PieceAssetsAdapter(ImageProvider):
     def __init__(self):
-        self.images = {}
+        self.images = [None] * 12
         self.load_images()
 
     def load_images(self):
-        pieces = ['p', 'r', 'n', 'b', 'q', 'k']
-        colors = ['w', 'b']
-        for color in colors:
-            for piece in pieces:
-                name = f"{color}_{piece}"
-                self.images[name] = pygame.transform.scale(
-                    pygame.image.load(f"assets/{name}.png"), (SQ_SIZE, SQ_SIZE))
+        # convert_alpha() needs a display surface, so this must run after
+        # pygame.display.set_mode() (Game.__init__ takes care of that).
+        for piece in PIECES:
+            name = str(piece)
+            surf = pygame.image.load(f"assets/{name}.png").convert_alpha()
+            self.images[piece.type_id] = pygame.transform.scale(surf, (SQ_SIZE, SQ_SIZE))
 
     def get_image(self, piece):
-        return self.images.get(str(piece))
+        return self.images[piece.type_id]
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+COLOR_INDEX = {'w': 0, 'b': 1}
+
+def iter_bits(bb):
+    while bb:
+        lsb = bb & -bb
+        yield lsb.bit_length() - 1
+        bb ^= lsb
+
+def build_step_attacks(offsets):
+    table = []
+    for sq in range(64):
+        x, y = sq & 7, sq >> 3
+        attacks = 0
+        for dx, dy in offsets:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < 8 and 0 <= ny < 8:
+                attacks |= 1 << (ny*8 + nx)
+        table.append(attacks)
+    return table
+
+# Built once at import and never mutated, so safe to share between threads.
+KNIGHT_ATTACKS = build_step_attacks([(-2, -1), (-1, -2), (1, -2), (2, -1),
+                                     (2, 1), (1, 2), (-1, 2), (-2, 1)])
+KING_ATTACKS = build_step_attacks([(-1, -1), (0, -1), (1, -1), (-1, 0),
+                                   (1, 0), (-1, 1), (0, 1), (1, 1)])
+
+def build_pawn_tables(dir, start_row):
+    attacks = build_step_attacks([(-1, -dir), (1, -dir)])
+    push, double_push = [], []
+    for sq in range(64):
+        x, y = sq & 7, sq >> 3
+        ny = y - dir
+        push.append(1 << (ny*8 + x) if 0 <= ny < 8 else 0)
+        double_push.append(1 << ((y - 2*dir)*8 + x) if y == start_row else 0)
+    return push, double_push, attacks
+
+# Indexed [color][sq] with white = 0. White pawns move towards row 0.
+PAWN_PUSH, PAWN_DOUBLE_PUSH, PAWN_ATTACKS = zip(build_pawn_tables(1, 6),
+                                               build_pawn_tables(-1, 1))
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+BB_MASK = (1 << 64) - 1
+
+# Generated by find_magics.py; tests/test_magic.py checks them against slide_attacks().
+ROOK_MAGIC = (
+    0x0080002280400012, 0x0700108040002100, 0x2080200008801000, 0x9080048010020800,
+    0x1200081084201600, 0x8080020049040080, 0x010020840A004B00, 0x21000282210000C2,
+    0x4809800081400060, 0x0142400140201000, 0x00A1001060090040, 0x6005000910010020,
+    0x8405000411080100, 0x0001000649000400, 0x000A000948040200, 0x2001000042008500,
+    0x8440058000228A40, 0x0000828040082000, 0x0005010020001040, 0x2C801A0040120020,
+    0x0100710008008D00, 0x00E2880140200410, 0x0003040030080201, 0x1010020000409401,
+    0x6022C00180086080, 0x0020044040033000, 0x0004A00280100080, 0x0008008080100029,
+    0x0005001500180110, 0x00420002000C0810, 0x0008040101000200, 0x0000040200005181,
+    0x8020C00860800080, 0x0200400C84802000, 0x0008861000802000, 0x1110008010802801,
+    0x4018000880800400, 0x0810140080801200, 0x000002100C004508, 0x4200008042000904,
+    0x1080824000208005, 0x0108460981020020, 0x4121006001410050, 0x4026000860120040,
+    0x14820004600A0030, 0x408E000890060004, 0x00220E1041040088, 0x602002D184020001,
+    0x0000408000211100, 0x04C100C000802100, 0x48404020005D0100, 0x0002080080100080,
+    0x8080280080440080, 0x2009008248040100, 0x0412000801042200, 0x0000006884090200,
+    0x001A021880210242, 0x0052514001008027, 0x4540098010204202, 0x0009082010010501,
+    0x8401001002440801, 0x0001002A18840005, 0x4000100201280884, 0x01120B002C024082,
+)
+BISHOP_MAGIC = (
+    0x8011040301420200, 0x0809500902002900, 0x2011011403011000, 0x00080A0028040508,
+    0xA8D1104084000020, 0xC042082424084229, 0x4004020210140102, 0x0000210110032100,
+    0x0E011014C1080214, 0x0010040102020200, 0x0418040812104000, 0x0401022182000018,
+    0x0014420A10400440, 0x0C40020210450000, 0x0600008230100480, 0x040A060201040708,
+    0xB140001002020C04, 0x000400A025C20602, 0x9048001404240210, 0x0008000082014084,
+    0x0008800400A01090, 0x0000804100600213, 0x3808808108273001, 0x240040420200AC02,
+    0x1860084A22480101, 0x8803141121480204, 0x0020300148018060, 0x0820080081004028,
+    0x4001010008504000, 0x0402020020480240, 0x0801004002080420, 0x0084004000210400,
+    0x9088C2400010141A, 0x00C4251411200C20, 0x0C84020100080040, 0x8404040400080120,
+    0x4000420020020081, 0x8021080021420200, 0x0244080441008400, 0x00010C0280102600,
+    0x4684022010910400, 0x8201089005005020, 0x0102042024080800, 0x00A0002019000800,
+    0x0080400102102100, 0x0110A00480200101, 0x00900202040000C0, 0x44042481A1001A00,
+    0x421C020110080100, 0x800A048088080100, 0x0100410080B02040, 0x0030200142088101,
+    0x0210822420820208, 0x0030404244630000, 0x0020204C00808006, 0x0015500208410412,
+    0x0026050092100200, 0x8800282105101100, 0x8400400021841000, 0x00004003A0A0880D,
+    0x041383002004240A, 0x1000084008010D00, 0x0A0214A004210A00, 0x08202C0108010A10,
+)
+
+def slide_attacks(sq, occ, directions):
+    x, y = sq & 7, sq >> 3
+    attacks = 0
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx < 8 and 0 <= ny < 8:
+            bit = 1 << (ny*8 + nx)
+            attacks |= bit
+            if occ & bit:
+                break
+            nx += dx
+            ny += dy
+    return attacks
+
+def relevant_mask(sq, directions):
+    # Edge squares never block anything beyond them, so leave them out of the index.
+    x, y = sq & 7, sq >> 3
+    mask = 0
+    for dx, dy in directions:
+        nx, ny = x + dx, y + dy
+        while 0 <= nx + dx < 8 and 0 <= ny + dy < 8:
+            mask |= 1 << (ny*8 + nx)
+            nx += dx
+            ny += dy
+    return mask
+
+def build_magic_tables(directions, magics):
+    masks, shifts, attacks = [], [], []
+    for sq in range(64):
+        mask = relevant_mask(sq, directions)
+        shift = 64 - bin(mask).count('1')
+        table = [0] * (1 << (64 - shift))
+        occ = 0
+        while True:
+            table[((occ * magics[sq]) & BB_MASK) >> shift] = slide_attacks(sq, occ, directions)
+            occ = (occ - mask) & mask
+            if not occ:
+                break
+        masks.append(mask)
+        shifts.append(shift)
+        attacks.append(table)
+    return masks, shifts, attacks
+
+ROOK_MASK, ROOK_SHIFT, ROOK_ATTACK = build_magic_tables(ROOK_DIRECTIONS, ROOK_MAGIC)
+BISHOP_MASK, BISHOP_SHIFT, BISHOP_ATTACK = build_magic_tables(BISHOP_DIRECTIONS, BISHOP_MAGIC)
+
+def rook_attacks(sq, occ):
+    return ROOK_ATTACK[sq][(((occ & ROOK_MASK[sq]) * ROOK_MAGIC[sq]) & BB_MASK) >> ROOK_SHIFT[sq]]
+
+def bishop_attacks(sq, occ):
+    return BISHOP_ATTACK[sq][(((occ & BISHOP_MASK[sq]) * BISHOP_MAGIC[sq]) & BB_MASK) >> BISHOP_SHIFT[sq]]
+
+# Move kernels work on plain integers only (square, total occupancy, own
+# occupancy) so callers can unpack the board once and reuse it for every
+# piece instead of paying attribute lookups per generator call.
+def king_moves(sq, occ, own):
+    return KING_ATTACKS[sq] & ~own
+
+def knight_moves(sq, occ, own):
+    return KNIGHT_ATTACKS[sq] & ~own
+
+def rook_moves(sq, occ, own):
+    return rook_attacks(sq, occ) & ~own
+
+def bishop_moves(sq, occ, own):
+    return bishop_attacks(sq, occ) & ~own
+
+def queen_moves(sq, occ, own):
+    # Both lookups inlined: one call frame instead of three.
+    rook = ROOK_ATTACK[sq][(((occ & ROOK_MASK[sq]) * ROOK_MAGIC[sq]) & BB_MASK) >> ROOK_SHIFT[sq]]
+    bishop = BISHOP_ATTACK[sq][(((occ & BISHOP_MASK[sq]) * BISHOP_MAGIC[sq]) & BB_MASK) >> BISHOP_SHIFT[sq]]
+    return (rook | bishop) & ~own
+
+def white_pawn_moves(sq, occ, own):
+    empty = ~occ
+    return (PAWN_PUSH[0][sq] & empty) | \
+           (PAWN_DOUBLE_PUSH[0][sq] & empty & (empty >> 8)) | \
+           (PAWN_ATTACKS[0][sq] & occ & ~own)
+
+def black_pawn_moves(sq, occ, own):
+    empty = ~occ
+    return (PAWN_PUSH[1][sq] & empty) | \
+           (PAWN_DOUBLE_PUSH[1][sq] & empty & (empty << 8)) | \
+           (PAWN_ATTACKS[1][sq] & occ & ~own)
+
+# Indexed like BitBoard.bb: color*6 + kind.
+MOVE_KERNELS = (
+    white_pawn_moves, knight_moves, bishop_moves, rook_moves, queen_moves, king_moves,
+    black_pawn_moves, knight_moves, bishop_moves, rook_moves, queen_moves, king_moves,
+)
 
 class Piece:
+    __slots__ = ('color', 'type_id')
+    kind = None
+
     def __init__(self, color):
         self.color = color
-        self.has_moved = False
-
-    def get_legal_moves(self, board, x, y):
-        return []
+        self.type_id = COLOR_INDEX[color] * 6 + self.kind
 
     def __str__(self):
         return f"{self.color}_{self.symbol}"
 
 class King(Piece):
+    __slots__ = ()
     symbol = 'k'
-    def get_legal_moves(self, board, x, y):
-        moves = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < 8 and 0 <= ny < 8:
-                    target = board[ny][nx]
-                    if target is None or target.color != self.color:
-                        moves.append((nx, ny))
-        return moves
+    kind = KING
 
 class Queen(Piece):
+    __slots__ = ()
     symbol = 'q'
-    def get_legal_moves(self, board, x, y):
-        return Rook(self.color).get_legal_moves(board, x, y) + \
-               Bishop(self.color).get_legal_moves(board, x, y)
+    kind = QUEEN
 
 class Rook(Piece):
+    __slots__ = ()
     symbol = 'r'
-    def get_legal_moves(self, board, x, y):
-        moves = []
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < 8 and 0 <= ny < 8:
-                target = board[ny][nx]
-                if target is None:
-                    moves.append((nx, ny))
-                elif target.color != self.color:
-                    moves.append((nx, ny))
-                    break
-                else:
-                    break
-                nx += dx
-                ny += dy
-        return moves
+    kind = ROOK
 
 class Bishop(Piece):
+    __slots__ = ()
     symbol = 'b'
-    def get_legal_moves(self, board, x, y):
-        moves = []
-        directions = [(1, 1), (-1, 1), (-1, -1), (1, -1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            while 0 <= nx < 8 and 0 <= ny < 8:
-                target = board[ny][nx]
-                if target is None:
-                    moves.append((nx, ny))
-                elif target.color != self.color:
-                    moves.append((nx, ny))
-                    break
-                else:
-                    break
-                nx += dx
-                ny += dy
-        return moves
+    kind = BISHOP
 
 class Knight(Piece):
+    __slots__ = ()
     symbol = 'n'
-    def get_legal_moves(self, board, x, y):
-        moves = []
-        for dx, dy in [(-2, -1), (-1, -2), (1, -2), (2, -1),
-                       (2, 1), (1, 2), (-1, 2), (-2, 1)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < 8 and 0 <= ny < 8:
-                target = board[ny][nx]
-                if target is None or target.color != self.color:
-                    moves.append((nx, ny))
-        return moves
+    kind = KNIGHT
 
 class Pawn(Piece):
+    __slots__ = ()
     symbol = 'p'
-    def get_legal_moves(self, board, x, y):
-        moves = []
-        dir = 1 if self.color == 'w' else -1
-        start_row = 6 if self.color == 'w' else 1
-        if board[y - dir][x] is None:
-            moves.append((x, y - dir))
-            if y == start_row and board[y - 2*dir][x] is None:
-                moves.append((x, y - 2*dir))
-        for dx in [-1, 1]:
-            nx = x + dx
-            ny = y - dir
-            if 0 <= nx < 8 and 0 <= ny < 8:
-                target = board[ny][nx]
-                if target and target.color != self.color:
-                    moves.append((nx, ny))
-        return moves
+    kind = PAWN
+
+# Pieces carry no per-square state, so every square shares one instance per
+# (color, type). Indexed like BitBoard.bb.
+WP, WN, WB, WR, WQ, WK = Pawn('w'), Knight('w'), Bishop('w'), Rook('w'), Queen('w'), King('w')
+BP, BN, BB, BR, BQ, BK = Pawn('b'), Knight('b'), Bishop('b'), Rook('b'), Queen('b'), King('b')
+PIECES = (WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK)
 
 class BoardRenderer:
     def __init__(self, screen, assets):
         self.screen = screen
         self.assets = assets
-
-    def draw_board(self):
+        self.bg = pygame.Surface((WIDTH, HEIGHT)).convert()
         colors = [pygame.Color(240, 217, 181), pygame.Color(181, 136, 99)]
         for row in range(8):
             for col in range(8):
                 color = colors[(row + col) % 2]
-                pygame.draw.rect(self.screen, color, pygame.Rect(col*SQ_SIZE, row*SQ_SIZE, SQ_SIZE, SQ_SIZE))
+                pygame.draw.rect(self.bg, color, pygame.Rect(col*SQ_SIZE, row*SQ_SIZE, SQ_SIZE, SQ_SIZE))
+
+    def draw_board(self):
+        self.screen.blit(self.bg, (0, 0))
 
     def draw_highlights(self, screen, moves):
-        for (x, y) in moves:
-            rect = pygame.Rect(x*SQ_SIZE, (7 - y)*SQ_SIZE, SQ_SIZE, SQ_SIZE)
-            pygame.draw.rect(screen, (0, 255, 0, 80), rect, 5)
+        for sq in iter_bits(moves):
+            pygame.draw.rect(screen, (0, 255, 0, 80), SQ_RECTS[sq >> 3][sq & 7], 5)
 
     def draw_pieces(self, board):
-        for y in range(8):
-            for x in range(8):
-                piece = board[y][x]
-                if piece:
-                    img = self.assets.get_image(piece)
-                    if img:
-                        self.screen.blit(img, pygame.Rect(x*SQ_SIZE, (7 - y)*SQ_SIZE, SQ_SIZE, SQ_SIZE))
-
-class Board:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(Board, cls).__new__(cls)
-            cls._instance.grid = [[None for _ in range(8)] for _ in range(8)]
-            cls._instance.init_pieces()
-        return cls._instance
+        for sq in iter_bits(board.occ_all):
+            img = self.assets.get_image(board.piece_at(sq))
+            if img:
+                self.screen.blit(img, (X_PX[sq & 7], Y_PX[sq >> 3]))
 
-    def init_pieces(self):
-        B = self.grid
-        for i in range(8):
-            B[1][i] = Pawn('b')
-            B[6][i] = Pawn('w')
-        order = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook]
-        for i, cls in enumerate(order):
-            B[0][i] = cls('b')
-            B[7][i] = cls('w')
+class BitBoard:
+    def __init__(self):
+        self.bb = [0] * 12
+        self.init_pieces()
+        self.init_legal_cache()
 
+    def init_pieces(self):
+        bb = self.bb
+        bb[PAWN] = 0x00FF000000000000
+        bb[KNIGHT] = 0x4200000000000000
+        bb[BISHOP] = 0x2400000000000000
+        bb[ROOK] = 0x8100000000000000
+        bb[QUEEN] = 0x0800000000000000
+        bb[KING] = 0x1000000000000000
+        bb[6 + PAWN] = 0x000000000000FF00
+        bb[6 + KNIGHT] = 0x0000000000000042
+        bb[6 + BISHOP] = 0x0000000000000024
+        bb[6 + ROOK] = 0x0000000000000081
+        bb[6 + QUEEN] = 0x0000000000000008
+        bb[6 + KING] = 0x0000000000000010
+        self.update_occupancy()
+        self.update_squares()
+
+    def update_occupancy(self):
+        bb = self.bb
+        self.occ_white = bb[0] | bb[1] | bb[2] | bb[3] | bb[4] | bb[5]
+        self.occ_black = bb[6] | bb[7] | bb[8] | bb[9] | bb[10] | bb[11]
+        self.occ_all = self.occ_white | self.occ_black
+
+    def update_squares(self):
+        # Mailbox mirror of bb: bitboard index per square, -1 when empty.
+        self.squares = [-1] * 64
+        for i, b in enumerate(self.bb):
+            for sq in iter_bits(b):
+                self.squares[sq] = i
+
+    def index_at(self, sq):
+        return self.squares[sq]
+
+    def piece_at(self, sq):
+        i = self.index_at(sq)
+        return PIECES[i] if i >= 0 else None
+
+    def move(self, from_sq, to_sq):
+        self.make_move(from_sq, to_sq, self.squares[from_sq], self.squares[to_sq])
+
+    def init_legal_cache(self):
+        self.legal_cache = {}
+        for sq in iter_bits(self.occ_all):
+            self.refresh_legal_moves(sq)
+
+    def refresh_legal_moves(self, sq):
+        piece = self.squares[sq]
+        own = self.occ_white if piece < 6 else self.occ_black
+        self.legal_cache[sq] = MOVE_KERNELS[piece](sq, self.occ_all, own)
+
+    def apply_move(self, from_sq, to_sq):
+        # Like move(), but keeps legal_cache current by regenerating only the
+        # pieces that could be affected: the mover, and anything that reaches
+        # from_sq or to_sq along a ray or by a knight jump. King and pawn steps
+        # are the first square of those rays. make_move() leaves the cache
+        # alone, so search must restore the board before the cache is read.
+        self.move(from_sq, to_sq)
+        self.legal_cache.pop(from_sq, None)
+        occ = self.occ_all
+        affected = 0
+        for sq in (from_sq, to_sq):
+            affected |= queen_moves(sq, occ, 0) | KNIGHT_ATTACKS[sq]
+        for sq in iter_bits((affected & occ) | (1 << to_sq)):
+            self.refresh_legal_moves(sq)
+
+    def make_move(self, from_sq, to_sq, piece, captured):
+        if captured >= 0:
+            self.bb[captured] ^= 1 << to_sq
+        self.bb[piece] ^= (1 << from_sq) | (1 << to_sq)
+        self.squares[from_sq] = -1
+        self.squares[to_sq] = piece
+        self.update_occupancy()
+
+    def unmake_move(self, from_sq, to_sq, piece, captured):
+        if captured >= 0:
+            self.bb[captured] ^= 1 << to_sq
+        self.bb[piece] ^= (1 << from_sq) | (1 << to_sq)
+        self.squares[from_sq] = piece
+        self.squares[to_sq] = captured
+        self.update_occupancy()
+
+    def generate_moves(self, color):
+        # Pseudo-legal (from_sq, to_sq, piece, captured) tuples; piece and captured
+        # are indices into self.bb, captured is -1 for quiet moves.
+        bb = self.bb
+        occ = self.occ_all
+        own, base = (self.occ_white, 0) if color == 'w' else (self.occ_black, 6)
+        squares = self.squares
+        moves = []
+        append = moves.append
+        for piece in range(base, base + 6):
+            kernel = MOVE_KERNELS[piece]
+            for from_sq in iter_bits(bb[piece]):
+                for to_sq in iter_bits(kernel(from_sq, occ, own)):
+                    append((from_sq, to_sq, piece, squares[to_sq]))
+        return moves
 
 class Game:
-    def __init__(self):
+    def __init__(self, ai_color=None, ai_depth=3):
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Custom Chess")
@@ -184,77 +389,103 @@ class Game:
 
         self.assets = PieceAssetsAdapter()
         self.renderer = BoardRenderer(self.screen, self.assets)
+        self.board = BitBoard()
 
         self.selected = None
         self.turn = 'w'
-        self.highlight_moves = []
+        self.highlight_mask = 0
+        self.dirty = True
+        self.dirty_rects = None
+        self.game_over = False
+
+        self.ai_color = ai_color
+        self.search = Search(ai_depth)
+
+    def mark_dirty(self, squares):
+        self.dirty = True
+        if self.dirty_rects is not None:
+            self.dirty_rects.extend(SQ_RECTS[sq >> 3][sq & 7] for sq in iter_bits(squares))
 
     def get_valid_moves(self, x, y):
-        piece = Board().grid[y][x]
+        piece = self.board.piece_at(y*8 + x)
         if piece is None or piece.color != self.turn:
-            return []
-        return piece.get_legal_moves(Board().grid, x, y)
+            return 0
+        return self.board.legal_cache[y*8 + x]
+
+    def play_move(self, from_sq, to_sq):
+        captured = self.board.index_at(to_sq)
+        self.board.apply_move(from_sq, to_sq)
+        self.turn = 'b' if self.turn == 'w' else 'w'
+        self.mark_dirty((1 << from_sq) | (1 << to_sq))
+        if captured >= 0 and captured % 6 == KING:
+            self.game_over = True
+
+    def play_ai_move(self):
+        move = self.search.best_move(self.board, self.turn)
+        if move is None:
+            # No pseudo-legal moves left for the engine's side.
+            self.game_over = True
+            return
+        self.play_move(move[0], move[1])
 
     def run(self):
+        # Bind hot callables and constants once so the loop body uses fast locals.
+        event_get = pygame.event.get
+        mouse_get_pos = pygame.mouse.get_pos
+        flip = pygame.display.flip
+        update = pygame.display.update
+        tick = self.clock.tick
+        draw_board = self.renderer.draw_board
+        draw_pieces = self.renderer.draw_pieces
+        draw_highlights = self.renderer.draw_highlights
+        QUIT, WINDOWEXPOSED, MOUSEBUTTONDOWN = pygame.QUIT, pygame.WINDOWEXPOSED, pygame.MOUSEBUTTONDOWN
+        board = self.board
+        screen = self.screen
+
         running = True
         while running:
-            self.renderer.draw_board()
-            self.renderer.draw_pieces(Board().grid)
-            self.renderer.draw_highlights(self.screen, self.highlight_moves)
-            pygame.display.flip()
+            if self.dirty:
+                draw_board()
+                draw_pieces(board)
+                draw_highlights(screen, self.highlight_mask)
+                if self.dirty_rects is None:
+                    flip()
+                else:
+                    update(self.dirty_rects)
+                self.dirty = False
+                self.dirty_rects = []
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            for event in event_get():
+                if event.type == QUIT:
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = pygame.mouse.get_pos()
+                elif event.type == WINDOWEXPOSED:
+                    self.dirty = True
+                    self.dirty_rects = None
+                elif event.type == MOUSEBUTTONDOWN and not self.game_over:
+                    x, y = mouse_get_pos()
                     bx, by = x // SQ_SIZE, 7 - (y // SQ_SIZE)
-                    clicked = Board().grid[by][bx]
+                    clicked = board.piece_at(by*8 + bx)
 
                     if self.selected:
                         from_x, from_y = self.selected
-                        piece = Board().grid[from_y][from_x]
+                        piece = board.piece_at(from_y*8 + from_x)
                         if piece and piece.color == self.turn:
-                            if (bx, by) in self.highlight_moves:
-                                Board().grid[by][bx] = piece
-                                Board().grid[from_y][from_x] = None
-                                self.turn = 'b' if self.turn == 'w' else 'w'
+                            if (self.highlight_mask >> (by*8 + bx)) & 1:
+                                self.play_move(from_y*8 + from_x, by*8 + bx)
+                        self.mark_dirty(self.highlight_mask)
                         self.selected = None
-                        self.highlight_moves = []
+                        self.highlight_mask = 0
                     elif clicked and clicked.color == self.turn:
                         self.selected = (bx, by)
-                        self.highlight_moves = self.get_valid_moves(bx, by)
-            self.clock.tick(30)
+                        self.highlight_mask = self.get_valid_moves(bx, by)
+                        self.mark_dirty(self.highlight_mask)
+
+            # Wait until the human's last move has been drawn before thinking.
+            # After game over the final position stays on screen until QUIT.
+            if running and not self.game_over and self.turn == self.ai_color and not self.dirty:
+                self.play_ai_move()
+            tick(30)
         pygame.quit()
 
-class GameManager:
-    _instance = None
-
-    @staticmethod
-    def get_instance():
-        if GameManager._instance is None:
-            GameManager()
-        return GameManager._instance
-
-    def __init__(self):
-        if GameManager._instance is not None:
-            raise Exception("This class is a singleton!")
-        GameManager._instance = self
-
-        self.current_turn = "white"
-        self.game_over = False
-
-    def switch_turn(self):
-        self.current_turn = "black" if self.current_turn == "white" else "white"
-
-    def get_turn(self):
-        return self.current_turn
-
-    def is_game_over(self):
-        return self.game_over
-
-    def end_game(self):
-        self.game_over = True
-
 if __name__ == "__main__":
-    Game().run()
+    Game(ai_color='b' if '--ai' in sys.argv else None).run()
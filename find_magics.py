@@ -0,0 +1,46 @@
+"""Regenerate ROOK_MAGIC and BISHOP_MAGIC for chess_g.py.
+
+Plain trial-and-error search: try sparse random 64-bit numbers until one maps
+every blocker subset of a square's relevant mask to a slot holding the right
+attack set. Seeded, so re-running prints the exact tables in chess_g.py.
+
+    python find_magics.py
+"""
+import os
+import random
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+from chess_g import (BB_MASK, BISHOP_DIRECTIONS, ROOK_DIRECTIONS,
+                     relevant_mask, slide_attacks)
+
+def find_magic(sq, directions, rng):
+    mask = relevant_mask(sq, directions)
+    shift = 64 - bin(mask).count('1')
+    occs, attacks = [], []
+    occ = 0
+    while True:
+        occs.append(occ)
+        attacks.append(slide_attacks(sq, occ, directions))
+        occ = (occ - mask) & mask
+        if not occ:
+            break
+    while True:
+        magic = rng.getrandbits(64) & rng.getrandbits(64) & rng.getrandbits(64)
+        table = {}
+        for occ, att in zip(occs, attacks):
+            if table.setdefault(((occ * magic) & BB_MASK) >> shift, att) != att:
+                break
+        else:
+            return magic
+
+def print_table(name, magics):
+    print(f'{name} = (')
+    for i in range(0, 64, 4):
+        print('    ' + ', '.join(f'0x{m:016X}' for m in magics[i:i + 4]) + ',')
+    print(')')
+
+if __name__ == "__main__":
+    rng = random.Random(2024)
+    for name, directions in (('ROOK_MAGIC', ROOK_DIRECTIONS), ('BISHOP_MAGIC', BISHOP_DIRECTIONS)):
+        print_table(name, [find_magic(sq, directions, rng) for sq in range(64)])
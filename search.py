@@ -0,0 +1,68 @@
+"""Negamax alpha-beta search over a chess_g.BitBoard.
+
+The board is only used through generate_moves / make_move / unmake_move and
+its bb list, so this module does not import the pygame front end.
+"""
+
+# Same kind order as chess_g: pawn, knight, bishop, rook, queen, king. Board
+# indices are color*6 + kind, so index % 6 gives the kind.
+KING = 5
+# Centipawn values indexed like BitBoard.bb.
+PIECE_VALUES = (100, 320, 330, 500, 900, 20000) * 2
+INF = 10 ** 9
+
+def evaluate(board, color):
+    bb = board.bb
+    score = 0
+    for i in range(6):
+        score += PIECE_VALUES[i] * (bin(bb[i]).count('1') - bin(bb[i + 6]).count('1'))
+    return score if color == 'w' else -score
+
+def order_moves(moves):
+    # MVV-LVA by ordinal kind: most valuable victim first, cheapest attacker
+    # breaking ties, quiet moves last in generation order.
+    moves.sort(key=lambda m: (m[3] % 6) * 16 - (m[2] % 6) if m[3] >= 0 else -INF,
+               reverse=True)
+    return moves
+
+def captures_king(move):
+    return move[3] >= 0 and move[3] % 6 == KING
+
+class Search:
+    def __init__(self, depth=3):
+        self.depth = depth
+
+    def negamax(self, board, depth, alpha, beta, color):
+        if depth == 0:
+            return evaluate(board, color)
+        other = 'b' if color == 'w' else 'w'
+        moves = order_moves(board.generate_moves(color))
+        if not moves:
+            return evaluate(board, color)
+        for move in moves:
+            if captures_king(move):
+                # Pseudo-legal search: taking the king ends the game. Prefer
+                # the shortest route to it by scaling with remaining depth.
+                return PIECE_VALUES[KING] * (depth + 1)
+            board.make_move(*move)
+            score = -self.negamax(board, depth - 1, -beta, -alpha, other)
+            board.unmake_move(*move)
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def best_move(self, board, color):
+        # Returns a (from_sq, to_sq, piece, captured) tuple, or None without moves.
+        other = 'b' if color == 'w' else 'w'
+        best, alpha = None, -INF
+        for move in order_moves(board.generate_moves(color)):
+            if captures_king(move):
+                return move
+            board.make_move(*move)
+            score = -self.negamax(board, self.depth - 1, -INF, -alpha, other)
+            board.unmake_move(*move)
+            if score > alpha:
+                best, alpha = move, score
+        return best
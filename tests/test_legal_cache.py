@@ -0,0 +1,29 @@
+import random
+
+from chess_g import KING, MOVE_KERNELS, BitBoard, iter_bits
+
+def full_regeneration(board):
+    cache = {}
+    for sq in iter_bits(board.occ_all):
+        piece = board.index_at(sq)
+        own = board.occ_white if piece < 6 else board.occ_black
+        cache[sq] = MOVE_KERNELS[piece](sq, board.occ_all, own)
+    return cache
+
+def test_initial_cache_matches_full_regeneration():
+    board = BitBoard()
+    assert board.legal_cache == full_regeneration(board)
+
+def test_apply_move_keeps_cache_in_sync_over_random_games():
+    rng = random.Random(5)
+    for _ in range(200):
+        board = BitBoard()
+        color = 'w'
+        for _ in range(80):
+            moves = board.generate_moves(color)
+            if not moves or not board.bb[KING] or not board.bb[6 + KING]:
+                break
+            from_sq, to_sq, _, _ = rng.choice(moves)
+            board.apply_move(from_sq, to_sq)
+            assert board.legal_cache == full_regeneration(board)
+            color = 'b' if color == 'w' else 'w'
@@ -0,0 +1,30 @@
+import random
+
+from chess_g import (BISHOP_DIRECTIONS, BISHOP_MASK, ROOK_DIRECTIONS, ROOK_MASK,
+                     bishop_attacks, rook_attacks, slide_attacks)
+
+def blocker_subsets(mask):
+    occ = 0
+    while True:
+        yield occ
+        occ = (occ - mask) & mask
+        if not occ:
+            return
+
+def test_rook_attacks_match_slide_attacks_for_every_blocker_subset():
+    for sq in range(64):
+        for occ in blocker_subsets(ROOK_MASK[sq]):
+            assert rook_attacks(sq, occ) == slide_attacks(sq, occ, ROOK_DIRECTIONS)
+
+def test_bishop_attacks_match_slide_attacks_for_every_blocker_subset():
+    for sq in range(64):
+        for occ in blocker_subsets(BISHOP_MASK[sq]):
+            assert bishop_attacks(sq, occ) == slide_attacks(sq, occ, BISHOP_DIRECTIONS)
+
+def test_attacks_ignore_occupancy_outside_the_mask():
+    rng = random.Random(0)
+    for _ in range(2000):
+        sq = rng.randrange(64)
+        occ = rng.getrandbits(64)
+        assert rook_attacks(sq, occ) == slide_attacks(sq, occ, ROOK_DIRECTIONS)
+        assert bishop_attacks(sq, occ) == slide_attacks(sq, occ, BISHOP_DIRECTIONS)
@@ -0,0 +1,106 @@
+import random
+
+from chess_g import (BISHOP, KING, KNIGHT, MOVE_KERNELS, QUEEN, ROOK,
+                     black_pawn_moves, iter_bits, king_moves, knight_moves,
+                     white_pawn_moves)
+
+def sq(x, y):
+    return y*8 + x
+
+def bits(*squares):
+    mask = 0
+    for s in squares:
+        mask |= 1 << s
+    return mask
+
+# Square-walking generators in the style of the original 8x8 grid code, used
+# as an independent reference for the table-driven kernels.
+STEPS = {
+    KNIGHT: [(-2, -1), (-1, -2), (1, -2), (2, -1), (2, 1), (1, 2), (-1, 2), (-2, 1)],
+    KING: [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)],
+}
+RAYS = {
+    ROOK: [(1, 0), (-1, 0), (0, 1), (0, -1)],
+    BISHOP: [(1, 1), (-1, 1), (-1, -1), (1, -1)],
+    QUEEN: [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (-1, -1), (1, -1)],
+}
+
+def reference_moves(grid, x, y):
+    color, kind = grid[(x, y)]
+    moves = set()
+    def free_or_enemy(nx, ny):
+        target = grid.get((nx, ny))
+        return target is None or target[0] != color
+    if kind in STEPS:
+        for dx, dy in STEPS[kind]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < 8 and 0 <= ny < 8 and free_or_enemy(nx, ny):
+                moves.add(sq(nx, ny))
+    elif kind in RAYS:
+        for dx, dy in RAYS[kind]:
+            nx, ny = x + dx, y + dy
+            while 0 <= nx < 8 and 0 <= ny < 8:
+                if free_or_enemy(nx, ny):
+                    moves.add(sq(nx, ny))
+                if (nx, ny) in grid:
+                    break
+                nx += dx
+                ny += dy
+    else:
+        dir = 1 if color == 0 else -1
+        start_row = 6 if color == 0 else 1
+        ny = y - dir
+        if 0 <= ny < 8:
+            if (x, ny) not in grid:
+                moves.add(sq(x, ny))
+                if y == start_row and (x, y - 2*dir) not in grid:
+                    moves.add(sq(x, y - 2*dir))
+            for nx in (x - 1, x + 1):
+                target = grid.get((nx, ny))
+                if 0 <= nx < 8 and target and target[0] != color:
+                    moves.add(sq(nx, ny))
+    return moves
+
+def test_kernels_match_reference_on_random_positions():
+    rng = random.Random(1)
+    for _ in range(3000):
+        grid = {}
+        for s in rng.sample(range(64), rng.randint(2, 32)):
+            grid[(s & 7, s >> 3)] = (rng.randrange(2), rng.randrange(6))
+        occ = bits(*(sq(x, y) for x, y in grid))
+        occ_by_color = [bits(*(sq(x, y) for (x, y), p in grid.items() if p[0] == c)) for c in (0, 1)]
+        for (x, y), (color, kind) in grid.items():
+            mask = MOVE_KERNELS[color*6 + kind](sq(x, y), occ, occ_by_color[color])
+            assert set(iter_bits(mask)) == reference_moves(grid, x, y)
+
+def test_double_push_blocked_by_piece_on_single_push_square():
+    # White moves towards row 0, black towards row 7.
+    assert white_pawn_moves(sq(4, 6), bits(sq(4, 6), sq(4, 5)), bits(sq(4, 6))) == 0
+    assert black_pawn_moves(sq(4, 1), bits(sq(4, 1), sq(4, 2)), bits(sq(4, 1))) == 0
+
+def test_double_push_blocked_only_on_target_square():
+    assert white_pawn_moves(sq(4, 6), bits(sq(4, 6), sq(4, 4)), bits(sq(4, 6))) == bits(sq(4, 5))
+    assert black_pawn_moves(sq(4, 1), bits(sq(4, 1), sq(4, 3)), bits(sq(4, 1))) == bits(sq(4, 2))
+
+def test_pawn_captures_on_edge_files_do_not_wrap():
+    # Enemies on both sides of the board edge; only the on-board diagonal counts.
+    own = bits(sq(0, 4))
+    occ = own | bits(sq(1, 3), sq(7, 3), sq(7, 2), sq(0, 3))
+    assert white_pawn_moves(sq(0, 4), occ, own) == bits(sq(1, 3))
+    own = bits(sq(7, 3))
+    occ = own | bits(sq(6, 4), sq(0, 4), sq(0, 5), sq(7, 4))
+    assert black_pawn_moves(sq(7, 3), occ, own) == bits(sq(6, 4))
+
+def test_pawn_on_last_rank_has_no_moves():
+    own = bits(sq(3, 0))
+    occ = own | bits(sq(2, 7), sq(4, 7))
+    assert white_pawn_moves(sq(3, 0), occ, own) == 0
+    own = bits(sq(3, 7))
+    occ = own | bits(sq(2, 0), sq(4, 0))
+    assert black_pawn_moves(sq(3, 7), occ, own) == 0
+
+def test_step_tables_at_corners_and_center():
+    assert knight_moves(sq(0, 0), 0, 0) == bits(sq(1, 2), sq(2, 1))
+    assert king_moves(sq(7, 7), 0, 0) == bits(sq(6, 7), sq(6, 6), sq(7, 6))
+    assert bin(knight_moves(sq(3, 3), 0, 0)).count('1') == 8
+    assert king_moves(sq(0, 0), bits(sq(1, 0)), bits(sq(1, 0))) == bits(sq(0, 1), sq(1, 1))
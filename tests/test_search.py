@@ -0,0 +1,31 @@
+from chess_g import KING, PAWN, QUEEN, BitBoard
+from search import Search, order_moves
+
+def test_order_moves_puts_most_valuable_victim_first():
+    # king takes black queen, pawn takes black pawn, quiet knight move
+    moves = [(0, 2, 0, 6), (0, 3, 1, -1), (0, 1, 5, 10)]
+    assert order_moves(moves) == [(0, 1, 5, 10), (0, 2, 0, 6), (0, 3, 1, -1)]
+
+def test_order_moves_prefers_cheapest_attacker_for_same_victim():
+    # queen and pawn both take the black rook
+    moves = [(0, 1, 4, 9), (2, 1, 0, 9)]
+    assert order_moves(moves) == [(2, 1, 0, 9), (0, 1, 4, 9)]
+
+def test_best_move_takes_the_king_immediately():
+    board = BitBoard()
+    board.bb = [0] * 12
+    board.bb[KING] = 1 << 63
+    board.bb[6 + QUEEN] = 1 << 62
+    board.bb[6 + KING] = 1 << 0
+    board.update_occupancy()
+    board.update_squares()
+    assert Search(3).best_move(board, 'b') == (62, 63, 6 + QUEEN, KING)
+
+def test_best_move_returns_none_without_moves():
+    board = BitBoard()
+    board.bb = [0] * 12
+    board.bb[PAWN] = 1 << 36
+    board.bb[6 + PAWN] = 1 << 28
+    board.update_occupancy()
+    board.update_squares()
+    assert Search(3).best_move(board, 'b') is None